@@ -1,9 +1,562 @@
+import time
+import warnings
+
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from torch.nn.modules.utils import _ntuple
 
 from ..builder import BACKBONES
-from .convnext import ConvNeXt
+from .convnext import Block, ConvNeXt
+
+_TSM_CPP_SOURCE = """
+torch::Tensor tsm_shift_forward(torch::Tensor x, int64_t num_segments,
+                                int64_t fold, bool reverse);
+torch::Tensor tsm_shift_dwconv_forward(torch::Tensor x, torch::Tensor weight,
+                                       c10::optional<torch::Tensor> bias,
+                                       int64_t num_segments, int64_t fold,
+                                       int64_t pad_h, int64_t pad_w);
+"""
+
+_TSM_CUDA_SOURCE = r"""
+#include <torch/extension.h>
+#include <ATen/AccumulateType.h>
+#include <ATen/cuda/CUDAContext.h>
+#include <c10/cuda/CUDAException.h>
+#include <c10/cuda/CUDAGuard.h>
+
+// Keep NCHW and channels_last inputs in their layout, anything else is
+// made NCHW contiguous.
+static bool dense_channels_last(torch::Tensor& x) {
+  if (x.is_contiguous()) return false;
+  if (x.is_contiguous(at::MemoryFormat::ChannelsLast)) return true;
+  x = x.contiguous();
+  return false;
+}
+
+// x and out are viewed as [N, C, HW] (or [N, HW, C] for channels_last) with
+// N = N' * T_. The first `fold` channels read frame t + direction, the next
+// `fold` channels read frame t - direction and out-of-range frames are zero.
+// direction = -1 gives the reverse shift used for the gradient.
+template <typename scalar_t>
+__global__ void tsm_shift_kernel(const scalar_t* __restrict__ x,
+                                 scalar_t* __restrict__ out,
+                                 const int64_t total, const int T_,
+                                 const int C, const int HW, const int fold,
+                                 const int direction,
+                                 const bool channels_last) {
+  const int64_t idx = (int64_t)blockIdx.x * blockDim.x + threadIdx.x;
+  if (idx >= total) return;
+  const int c = channels_last ? idx % C : (idx / HW) % C;
+  const int t = (idx / ((int64_t)HW * C)) % T_;
+  const int64_t frame = (int64_t)C * HW;
+  int offset = 0;
+  if (c < fold) {
+    offset = direction;
+  } else if (c < 2 * fold) {
+    offset = -direction;
+  }
+  const int src = t + offset;
+  out[idx] = (src >= 0 && src < T_) ? x[idx + offset * frame] : scalar_t(0);
+}
+
+torch::Tensor tsm_shift_forward(torch::Tensor x, int64_t num_segments,
+                                int64_t fold, bool reverse) {
+  TORCH_CHECK(x.is_cuda(), "tsm_shift_forward: x must be a CUDA tensor");
+  TORCH_CHECK(x.dim() == 4, "tsm_shift_forward: x must be [N, C, H, W]");
+  TORCH_CHECK(num_segments > 0 && x.size(0) % num_segments == 0,
+              "tsm_shift_forward: batch size ", x.size(0),
+              " is not divisible by num_segments ", num_segments);
+  const bool channels_last = dense_channels_last(x);
+  // preserves the channels_last strides of x
+  auto out = torch::empty_like(x);
+  const int64_t total = x.numel();
+  if (total == 0) return out;
+
+  const at::cuda::CUDAGuard device_guard(x.device());
+  const int threads = 256;
+  const dim3 blocks((unsigned int)((total + threads - 1) / threads));
+  auto stream = at::cuda::getCurrentCUDAStream();
+  AT_DISPATCH_FLOATING_TYPES_AND2(
+      at::ScalarType::Half, at::ScalarType::BFloat16, x.scalar_type(),
+      "tsm_shift_forward", [&] {
+        tsm_shift_kernel<scalar_t><<<blocks, threads, 0, stream>>>(
+            x.data_ptr<scalar_t>(), out.data_ptr<scalar_t>(), total,
+            (int)num_segments, (int)x.size(1),
+            (int)(x.size(2) * x.size(3)), (int)fold, reverse ? -1 : 1,
+            channels_last);
+      });
+  C10_CUDA_KERNEL_LAUNCH_CHECK();
+  return out;
+}
+
+// Depthwise conv (stride 1, dilation 1, zero padding) of the temporally
+// shifted x, reading the shifted frame inside the conv instead of
+// materializing the shift. A frame shifted in from outside the clip is all
+// zeros, so its output is just the bias.
+template <typename scalar_t>
+__global__ void tsm_shift_dwconv_kernel(
+    const scalar_t* __restrict__ x, const scalar_t* __restrict__ weight,
+    const scalar_t* __restrict__ bias, scalar_t* __restrict__ out,
+    const int64_t total, const int T_, const int C, const int H, const int W,
+    const int H_out, const int W_out, const int KH, const int KW,
+    const int pad_h, const int pad_w, const int fold,
+    const bool channels_last) {
+  using acc_t = at::acc_type<scalar_t, true>;
+  const int64_t idx = (int64_t)blockIdx.x * blockDim.x + threadIdx.x;
+  if (idx >= total) return;
+  int c, oh, ow;
+  if (channels_last) {
+    c = idx % C;
+    ow = (idx / C) % W_out;
+    oh = (idx / ((int64_t)C * W_out)) % H_out;
+  } else {
+    ow = idx % W_out;
+    oh = (idx / W_out) % H_out;
+    c = (idx / ((int64_t)W_out * H_out)) % C;
+  }
+  const int64_t n = idx / ((int64_t)W_out * H_out * C);
+  const int t = n % T_;
+  int offset = 0;
+  if (c < fold) {
+    offset = 1;
+  } else if (c < 2 * fold) {
+    offset = -1;
+  }
+
+  acc_t acc = bias == nullptr ? acc_t(0) : static_cast<acc_t>(bias[c]);
+  const int src = t + offset;
+  if (src >= 0 && src < T_) {
+    // pixel (ih, iw) of channel c in the source frame is
+    // x_plane[(ih * W + iw) * pixel_stride]
+    const int64_t frame = (int64_t)C * H * W;
+    const scalar_t* x_plane =
+        x + (n + offset) * frame + (channels_last ? c : (int64_t)c * H * W);
+    const int pixel_stride = channels_last ? C : 1;
+    const scalar_t* w_plane = weight + (int64_t)c * KH * KW;
+    for (int kh = 0; kh < KH; ++kh) {
+      const int ih = oh - pad_h + kh;
+      if (ih < 0 || ih >= H) continue;
+      for (int kw = 0; kw < KW; ++kw) {
+        const int iw = ow - pad_w + kw;
+        if (iw < 0 || iw >= W) continue;
+        acc += static_cast<acc_t>(
+                   x_plane[(int64_t)(ih * W + iw) * pixel_stride]) *
+               static_cast<acc_t>(w_plane[kh * KW + kw]);
+      }
+    }
+  }
+  out[idx] = static_cast<scalar_t>(acc);
+}
+
+torch::Tensor tsm_shift_dwconv_forward(torch::Tensor x, torch::Tensor weight,
+                                       c10::optional<torch::Tensor> bias,
+                                       int64_t num_segments, int64_t fold,
+                                       int64_t pad_h, int64_t pad_w) {
+  TORCH_CHECK(x.is_cuda(), "tsm_shift_dwconv_forward: x must be CUDA");
+  TORCH_CHECK(x.dim() == 4, "tsm_shift_dwconv_forward: x must be [N, C, H, W]");
+  TORCH_CHECK(num_segments > 0 && x.size(0) % num_segments == 0,
+              "tsm_shift_dwconv_forward: batch size ", x.size(0),
+              " is not divisible by num_segments ", num_segments);
+  TORCH_CHECK(weight.dim() == 4 && weight.size(0) == x.size(1) &&
+                  weight.size(1) == 1,
+              "tsm_shift_dwconv_forward: weight must be [C, 1, KH, KW]");
+  const bool channels_last = dense_channels_last(x);
+  weight = weight.contiguous();
+  const bool has_bias = bias.has_value() && bias->defined();
+  torch::Tensor b = has_bias ? bias->contiguous() : torch::Tensor();
+
+  const int64_t N = x.size(0), C = x.size(1), H = x.size(2), W = x.size(3);
+  const int64_t KH = weight.size(2), KW = weight.size(3);
+  const int64_t H_out = H + 2 * pad_h - KH + 1;
+  const int64_t W_out = W + 2 * pad_w - KW + 1;
+  auto out = torch::empty(
+      {N, C, H_out, W_out},
+      x.options().memory_format(channels_last
+                                    ? at::MemoryFormat::ChannelsLast
+                                    : at::MemoryFormat::Contiguous));
+  const int64_t total = out.numel();
+  if (total == 0) return out;
+
+  const at::cuda::CUDAGuard device_guard(x.device());
+  const int threads = 256;
+  const dim3 blocks((unsigned int)((total + threads - 1) / threads));
+  auto stream = at::cuda::getCurrentCUDAStream();
+  AT_DISPATCH_FLOATING_TYPES_AND2(
+      at::ScalarType::Half, at::ScalarType::BFloat16, x.scalar_type(),
+      "tsm_shift_dwconv_forward", [&] {
+        tsm_shift_dwconv_kernel<scalar_t><<<blocks, threads, 0, stream>>>(
+            x.data_ptr<scalar_t>(), weight.data_ptr<scalar_t>(),
+            has_bias ? b.data_ptr<scalar_t>() : nullptr,
+            out.data_ptr<scalar_t>(), total, (int)num_segments, (int)C,
+            (int)H, (int)W, (int)H_out, (int)W_out, (int)KH, (int)KW,
+            (int)pad_h, (int)pad_w, (int)fold, channels_last);
+      });
+  C10_CUDA_KERNEL_LAUNCH_CHECK();
+  return out;
+}
+"""
+
+# None: not built yet, False: build failed, otherwise the extension module
+_tsm_cuda_ext = None
+
+
+def _load_tsm_cuda_ext():
+    """Build the fused temporal shift CUDA kernel on first use.
+
+    Returns:
+        module | None: The compiled extension, or None if it can't be built
+            in the current environment.
+    """
+    global _tsm_cuda_ext
+    if _tsm_cuda_ext is None:
+        try:
+            from torch.utils.cpp_extension import load_inline
+            _tsm_cuda_ext = load_inline(
+                name='tsm_shift',
+                cpp_sources=_TSM_CPP_SOURCE,
+                cuda_sources=_TSM_CUDA_SOURCE,
+                functions=[
+                    'tsm_shift_forward', 'tsm_shift_dwconv_forward'
+                ])
+        except Exception as e:
+            warnings.warn('Failed to build the fused temporal shift kernel, '
+                          f'falling back to the PyTorch implementation: {e}')
+            _tsm_cuda_ext = False
+    return _tsm_cuda_ext or None
+
+
+class _FusedTemporalShift(torch.autograd.Function):
+    """Temporal shift in a single CUDA kernel.
+
+    The gradient of a temporal shift is the same shift in the opposite
+    direction, so the backward pass reuses the forward kernel.
+    """
+
+    @staticmethod
+    def forward(ctx, x, num_segments, fold):
+        ctx.num_segments = num_segments
+        ctx.fold = fold
+        return _tsm_cuda_ext.tsm_shift_forward(x, num_segments, fold, False)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        grad_input = _tsm_cuda_ext.tsm_shift_forward(grad_output,
+                                                     ctx.num_segments,
+                                                     ctx.fold, True)
+        return grad_input, None, None
+
+
+class _FusedShiftDWConv(torch.autograd.Function):
+    """Temporal shift followed by a depthwise conv in a single CUDA kernel.
+
+    The shifted input is never stored. The backward pass recomputes it with
+    the shift kernel for the weight gradient, and shifts the input gradient
+    back in the opposite direction.
+    """
+
+    @staticmethod
+    def forward(ctx, x, weight, bias, num_segments, fold, padding):
+        ctx.save_for_backward(x, weight)
+        ctx.has_bias = bias is not None
+        ctx.num_segments = num_segments
+        ctx.fold = fold
+        ctx.padding = padding
+        return _tsm_cuda_ext.tsm_shift_dwconv_forward(x, weight, bias,
+                                                      num_segments, fold,
+                                                      *padding)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        x, weight = ctx.saved_tensors
+        groups = weight.size(0)
+        grad_input = grad_weight = grad_bias = None
+
+        if ctx.needs_input_grad[0]:
+            grad_shifted = torch.nn.grad.conv2d_input(
+                x.shape, weight, grad_output, padding=ctx.padding,
+                groups=groups)
+            grad_input = _tsm_cuda_ext.tsm_shift_forward(
+                grad_shifted, ctx.num_segments, ctx.fold, True)
+        if ctx.needs_input_grad[1]:
+            x_shifted = _tsm_cuda_ext.tsm_shift_forward(
+                x, ctx.num_segments, ctx.fold, False)
+            grad_weight = torch.nn.grad.conv2d_weight(
+                x_shifted, weight.shape, grad_output, padding=ctx.padding,
+                groups=groups)
+        if ctx.has_bias and ctx.needs_input_grad[2]:
+            grad_bias = grad_output.sum((0, 2, 3))
+        return grad_input, grad_weight, grad_bias, None, None, None
+
+
+def _shift_groups(x: torch.Tensor, fold: int, dim: int) -> torch.Tensor:
+    """Shift the channel groups of a [N // num_segments, num_segments, ...]
+    feature along the time axis.
+
+    Args:
+        x (torch.Tensor): The input feature with time at axis 1.
+        fold (int): Number of channels shifted in each direction.
+        dim (int): The channel axis of ``x``.
+
+    Returns:
+        torch.Tensor: The shifted feature in the layout of ``x``.
+    """
+    num_segments = x.size(1)
+    rest = x.size(dim) - 2 * fold
+
+    # fill a single output buffer instead of concatenating three splits
+    out = torch.empty_like(x)
+
+    # shift left on num_segments channel in the first fold
+    left = out.narrow(dim, 0, fold)
+    left.narrow(1, 0, num_segments - 1).copy_(
+        x.narrow(dim, 0, fold).narrow(1, 1, num_segments - 1))
+    left.narrow(1, num_segments - 1, 1).zero_()
+
+    # shift right on num_segments channel in the second fold
+    mid = out.narrow(dim, fold, fold)
+    mid.narrow(1, 1, num_segments - 1).copy_(
+        x.narrow(dim, fold, fold).narrow(1, 0, num_segments - 1))
+    mid.narrow(1, 0, 1).zero_()
+
+    # remaining channels: no shift
+    out.narrow(dim, 2 * fold, rest).copy_(x.narrow(dim, 2 * fold, rest))
+    return out
+
+
+def _shift_copy(x: torch.Tensor, num_segments: int,
+                fold: int) -> torch.Tensor:
+    """Temporal shift written as copies into a preallocated output.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+        num_segments (int): Number of frame segments.
+        fold (int): Number of channels shifted in each direction.
+
+    Returns:
+        torch.Tensor: The shifted feature.
+    """
+    n, c, h, w = x.size()
+
+    if x.is_contiguous(memory_format=torch.channels_last):
+        # [N // num_segments, num_segments, H*W, C]
+        # slice channels along the innermost axis, no layout flip needed
+        x = x.permute(0, 2, 3, 1).view(-1, num_segments, h * w, c)
+        out = _shift_groups(x, fold, 3)
+        # [N, C, H, W] stored as channels_last
+        return out.view(n, h, w, c).permute(0, 3, 1, 2)
+
+    # view needs a contiguous input, only copy when it is neither NCHW nor
+    # channels_last contiguous
+    if not x.is_contiguous():
+        x = x.contiguous()
+
+    # [N // num_segments, num_segments, C, H, W]
+    x = x.view(-1, num_segments, c, h, w)
+    out = _shift_groups(x, fold, 2)
+
+    # [N, C, H, W]
+    # restore the original dimension
+    return out.view(n, c, h, w)
+
+
+# scripted so that the slicing and copies run without Python overhead, the
+# plain function is kept for torch.compile to trace
+_scripted_shift_copy = torch.jit.script(_shift_copy)
+
+
+def _time_view(x, num_segments):
+    """View a [N, C, H, W] feature as [N // num_segments, num_segments, ...].
+
+    Channels_last inputs are viewed as [N // num_segments, num_segments, H,
+    W, C], so ops that allocate a contiguous output keep the NHWC layout.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+        num_segments (int): Number of frame segments.
+
+    Returns:
+        tuple[torch.Tensor, int]: The view and its channel axis.
+    """
+    n, c, h, w = x.size()
+    if x.is_contiguous(memory_format=torch.channels_last):
+        return x.permute(0, 2, 3, 1).view(-1, num_segments, h, w, c), 4
+    return x.contiguous().view(-1, num_segments, c, h, w), 2
+
+
+def _time_unview(out, dim):
+    """Undo :func:`_time_view` on a contiguous output in the layout of the
+    view.
+
+    Args:
+        out (torch.Tensor): The output with time at axis 1.
+        dim (int): The channel axis of ``out``.
+
+    Returns:
+        torch.Tensor: ``out`` in [N, C, H, W], channels_last if ``dim`` is
+            the last axis.
+    """
+    out = out.flatten(0, 1)
+    if dim == 4:
+        return out.permute(0, 3, 1, 2)
+    return out
+
+
+def _shift_roll(x, num_segments, fold):
+    """Temporal shift built from ``torch.roll`` on the shifted groups.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+        num_segments (int): Number of frame segments.
+        fold (int): Number of channels shifted in each direction.
+
+    Returns:
+        torch.Tensor: The shifted feature.
+    """
+    x5, dim = _time_view(x, num_segments)
+
+    # roll the frames and blank the one that wrapped around
+    left = x5.narrow(dim, 0, fold).roll(-1, 1)
+    left.narrow(1, num_segments - 1, 1).zero_()
+    mid = x5.narrow(dim, fold, fold).roll(1, 1)
+    mid.narrow(1, 0, 1).zero_()
+
+    rest = x5.narrow(dim, 2 * fold, x.size(1) - 2 * fold)
+    out = torch.cat((left, mid, rest), dim)
+    return _time_unview(out, dim)
+
+
+def _shift_pad(x, num_segments, fold):
+    """Temporal shift built from zero padding ``F.pad`` on the shifted
+    groups.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+        num_segments (int): Number of frame segments.
+        fold (int): Number of channels shifted in each direction.
+
+    Returns:
+        torch.Tensor: The shifted feature.
+    """
+    x5, dim = _time_view(x, num_segments)
+
+    # drop one boundary frame and zero pad the other end of time, the pad
+    # covers the last four axes and only touches num_segments (axis 1)
+    left = F.pad(
+        x5.narrow(dim, 0, fold).narrow(1, 1, num_segments - 1),
+        (0, 0, 0, 0, 0, 0, 0, 1),
+        value=0.)
+    mid = F.pad(
+        x5.narrow(dim, fold, fold).narrow(1, 0, num_segments - 1),
+        (0, 0, 0, 0, 0, 0, 1, 0),
+        value=0.)
+
+    rest = x5.narrow(dim, 2 * fold, x.size(1) - 2 * fold)
+    out = torch.cat((left, mid, rest), dim)
+    return _time_unview(out, dim)
+
+
+# the fastest CPU implementation per (channels, H * W, channels_last), picked
+# on the first CPU call with that key since stage 0 and stage 3 features
+# don't favour the same one
+_cpu_shift = {}
+
+
+def _select_cpu_shift(x, num_segments, fold, key):
+    """Time the CPU implementations once on a real input and keep the
+    fastest one for all later calls with the same ``key``.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+        num_segments (int): Number of frame segments.
+        fold (int): Number of channels shifted in each direction.
+        key (tuple): The cache key of ``x``, see :func:`_temporal_shift`.
+
+    Returns:
+        callable: The selected shift implementation.
+    """
+    candidates = (_scripted_shift_copy, _shift_roll, _shift_pad)
+    timings = []
+    with torch.no_grad():
+        for shift in candidates:
+            # warm up, the first scripted call also runs the profiler
+            shift(x, num_segments, fold)
+            start = time.perf_counter()
+            for _ in range(3):
+                shift(x, num_segments, fold)
+            timings.append(time.perf_counter() - start)
+    _cpu_shift[key] = candidates[timings.index(min(timings))]
+    return _cpu_shift[key]
+
+
+def _is_compiling():
+    """Whether the current call is being traced by ``torch.compile``."""
+    if hasattr(torch, 'compiler') and hasattr(torch.compiler,
+                                              'is_compiling'):
+        return torch.compiler.is_compiling()
+    if hasattr(torch, '_dynamo'):
+        return torch._dynamo.is_compiling()
+    return False
+
+
+def _cuda_autocast_dtype():
+    """The dtype of the enabled CUDA autocast region, or None outside of
+    one."""
+    # the device type argument replaces the deprecated gpu variants in
+    # PyTorch 2.4
+    if hasattr(torch, 'get_autocast_dtype'):
+        if not torch.is_autocast_enabled('cuda'):
+            return None
+        return torch.get_autocast_dtype('cuda')
+    if not torch.is_autocast_enabled():
+        return None
+    return torch.get_autocast_gpu_dtype()
+
+
+def _dense(x):
+    """Make ``x`` contiguous unless it already is, in either the NCHW or the
+    channels_last memory format.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+
+    Returns:
+        torch.Tensor: ``x`` itself, or an NCHW contiguous copy of it.
+    """
+    if x.is_contiguous() or x.is_contiguous(
+            memory_format=torch.channels_last):
+        return x
+    return x.contiguous()
+
+
+def _temporal_shift(x, num_segments, fold):
+    """Shift ``fold`` channels each way in time with the fastest available
+    implementation.
+
+    Args:
+        x (torch.Tensor): The input feature in [N, C, H, W].
+        num_segments (int): Number of frame segments.
+        fold (int): Number of channels shifted in each direction.
+
+    Returns:
+        torch.Tensor: The shifted feature.
+    """
+    # neither the extension nor TorchScript can be traced, give the
+    # compiler the plain ops so it can fuse them with the following layers
+    if _is_compiling():
+        return _shift_copy(x, num_segments, fold)
+
+    if x.is_cuda and _load_tsm_cuda_ext() is not None:
+        return _FusedTemporalShift.apply(_dense(x), num_segments, fold)
+
+    if not x.is_cuda:
+        _, c, h, w = x.size()
+        key = (c, h * w, x.is_contiguous(memory_format=torch.channels_last))
+        shift = _cpu_shift.get(key) or _select_cpu_shift(
+            x, num_segments, fold, key)
+        return shift(x, num_segments, fold)
+
+    return _scripted_shift_copy(x, num_segments, fold)
 
 
 class TemporalShift(nn.Module):
@@ -24,6 +577,15 @@ class TemporalShift(nn.Module):
         self.net = net
         self.num_segments = num_segments
         self.shift_div = shift_div
+        # the channel count is fixed by ``net``, so the shift fold is
+        # computed once on the first call
+        self._fold = None
+
+    def _get_fold(self, x):
+        """Get the shift fold for the channels of ``x``."""
+        if self._fold is None:
+            self._fold = x.size(1) // self.shift_div
+        return self._fold
 
     def forward(self, x):
         """Defines the computation performed at every call.
@@ -34,7 +596,7 @@ class TemporalShift(nn.Module):
         Returns:
             torch.Tensor: The output of the module.
         """
-        x = self.shift(x, self.num_segments, shift_div=self.shift_div)
+        x = _temporal_shift(x, self.num_segments, self._get_fold(x))
         return self.net(x)
 
     @staticmethod
@@ -49,45 +611,56 @@ class TemporalShift(nn.Module):
         Returns:
             torch.Tensor: The shifted feature.
         """
-        # [N, C, H, W]
-        n, c, h, w = x.size()
-
-        # [N // num_segments, num_segments, C, H*W]
-        # can't use 5 dimensional array on PPL2D backend for caffe
-        x = x.view(-1, num_segments, c, h * w)
-
         # get shift fold
-        fold = c // shift_div
+        fold = x.size(1) // shift_div
+        return _temporal_shift(x, num_segments, fold)
 
-        # split c channel into three parts:
-        # left_split, mid_split, right_split
-        left_split = x[:, :, :fold, :]
-        mid_split = x[:, :, fold:2 * fold, :]
-        right_split = x[:, :, 2 * fold:, :]
 
-        # can't use torch.zeros(*A.shape) or torch.zeros_like(A)
-        # because array on caffe inference must be got by computing
+class TemporalShiftDWConv(TemporalShift):
+    """Temporal shift fused with the depthwise conv that follows it.
 
-        # shift left on num_segments channel in `left_split`
-        zeros = left_split - left_split
-        blank = zeros[:, :1, :, :]
-        left_split = left_split[:, 1:, :, :]
-        left_split = torch.cat((left_split, blank), 1)
+    The shifted frames are read directly inside the conv kernel, so the
+    shifted feature is never materialized. It falls back to
+    :class:`TemporalShift` when the fused kernel can't be used.
 
-        # shift right on num_segments channel in `mid_split`
-        zeros = mid_split - mid_split
-        blank = zeros[:, :1, :, :]
-        mid_split = mid_split[:, :-1, :, :]
-        mid_split = torch.cat((blank, mid_split), 1)
+    Args:
+        net (nn.Conv2d): Depthwise conv applied after the shift.
+        num_segments (int): Number of frame segments. Default: 3.
+        shift_div (int): Number of divisions for shift. Default: 8.
+    """
 
-        # right_split: no shift
+    def __init__(self, net, num_segments=3, shift_div=8):
+        super().__init__(net, num_segments=num_segments, shift_div=shift_div)
+        self.fusable = (
+            isinstance(net, nn.Conv2d)
+            and net.groups == net.in_channels == net.out_channels
+            and net.stride == (1, 1) and net.dilation == (1, 1)
+            and isinstance(net.padding, tuple)
+            and net.padding_mode == 'zeros')
 
-        # concatenate
-        out = torch.cat((left_split, mid_split, right_split), 2)
+    def forward(self, x):
+        """Defines the computation performed at every call.
 
-        # [N, C, H, W]
-        # restore the original dimension
-        return out.view(n, c, h, w)
+        Args:
+            x (torch.Tensor): The input data.
+
+        Returns:
+            torch.Tensor: The output of the module.
+        """
+        if (self.fusable and x.is_cuda and not _is_compiling()
+                and _load_tsm_cuda_ext() is not None):
+            conv = self.net
+            fold = self._get_fold(x)
+            # match what autocast would do for the nn.Conv2d fallback
+            dtype = _cuda_autocast_dtype()
+            if dtype is not None:
+                x = x.to(dtype)
+            bias = None if conv.bias is None else conv.bias.to(x.dtype)
+            return _FusedShiftDWConv.apply(_dense(x),
+                                           conv.weight.to(x.dtype), bias,
+                                           self.num_segments, fold,
+                                           conv.padding)
+        return super().forward(x)
 
 
 @BACKBONES.register_module()
@@ -104,9 +677,16 @@ class ConvNeXtTSM(ConvNeXt):
             If set to 'block', it will apply temporal shift to all child blocks
             in each convnext layer.
             If set to 'block_convnext', it will apply temporal shift to each `dwconv`
-            layer of all child blocks in each convnext layer.
+            layer of all child blocks in each convnext layer, fused with the
+            conv on CUDA when the kernel can be built.
             Default: 'block_convnext'.
         temporal_pool (bool): Whether to add temporal pooling. Default: False.
+        compile_shift (bool): Whether to compile the forward of every
+            temporal shift module with ``torch.compile``, so the shift is
+            fused with the wrapped layer. Requires PyTorch >= 2.0.
+            Default: False.
+        bf16 (bool): Whether to run the backbone under bfloat16 autocast on
+            CUDA. The output is cast back to the input dtype. Default: False.
         **kwargs (keyword arguments, optional): Arguments for ResNet.
     """
 
@@ -117,6 +697,8 @@ class ConvNeXtTSM(ConvNeXt):
                  shift_div=8,
                  shift_place='block_convnext',
                  temporal_pool=False,
+                 compile_shift=False,
+                 bf16=False,
                  **kwargs):
         super().__init__(name, **kwargs)
         self.num_segments = num_segments
@@ -124,8 +706,32 @@ class ConvNeXtTSM(ConvNeXt):
         self.shift_div = shift_div
         self.shift_place = shift_place
         self.temporal_pool = temporal_pool
+        self.compile_shift = compile_shift
+        self.bf16 = bf16
 
 
+    def forward(self, x):
+        """Defines the computation performed at every call.
+
+        The input is converted to channels_last once so that the whole
+        network, including the temporal shifts, runs in NHWC. With ``bf16``
+        the backbone runs under bfloat16 autocast, which halves the memory
+        traffic of the shifts.
+
+        Args:
+            x (torch.Tensor): The input data.
+
+        Returns:
+            torch.Tensor: The feature of the input samples extracted
+                by the backbone.
+        """
+        x = x.contiguous(memory_format=torch.channels_last)
+        if self.bf16 and x.is_cuda:
+            with torch.autocast(device_type='cuda', dtype=torch.bfloat16):
+                out = super().forward(x)
+            return out.to(x.dtype)
+        return super().forward(x)
+
     def make_temporal_shift(self):
         """Make temporal shift for some layers."""
         if self.temporal_pool:
@@ -138,69 +744,79 @@ class ConvNeXtTSM(ConvNeXt):
         if num_segment_list[-1] <= 0:
             raise ValueError('num_segment_list[-1] must be positive')
 
+        # list the children of every stage once
+        stage_children = [
+            list(stage.named_children()) for stage in self.stages
+        ]
+
         if self.shift_place == 'block':
 
-            def make_block_temporal(stage, num_segments):
-                """Make temporal shift on some blocks.
+            def make_block_temporal(stage, children, num_segments):
+                """Make temporal shift on some blocks in place.
 
                 Args:
                     stage (nn.Module): Model layers to be shifted.
+                    children (list[tuple[str, nn.Module]]): Named children
+                        of ``stage``.
                     num_segments (int): Number of frame segments.
-
-                Returns:
-                    nn.Module: The shifted blocks.
                 """
-                blocks = list(stage.children())
-                for i, b in enumerate(blocks):
-                    blocks[i] = TemporalShift(
+                for name, b in children:
+                    # ConvNeXt stages only hold Blocks, this guard keeps
+                    # any other child from being shifted should that change
+                    if not isinstance(b, Block):
+                        continue
+                    stage._modules[name] = TemporalShift(
                         b, num_segments=num_segments, shift_div=self.shift_div)
-                return nn.Sequential(*blocks)
-
-            self.stages[0] = make_block_temporal(self.stages[0], num_segment_list[0])
-            self.stages[1] = make_block_temporal(self.stages[1], num_segment_list[1])
-            self.stages[2] = make_block_temporal(self.stages[2], num_segment_list[2])
-            self.stages[3] = make_block_temporal(self.stages[3], num_segment_list[3])
 
         elif 'block_convnext' in self.shift_place:
-            n_round = 1
-            if len(list(self.stages[3].children())) >= 23:
-                n_round = 2
+            # shift every ``n_round``-th block
+            n_round = 2 if len(stage_children[3]) >= 23 else 1
 
-            def make_block_temporal(stage, num_segments):
-                """Make temporal shift on some blocks.
+            def make_block_temporal(stage, children, num_segments):
+                """Make temporal shift on some blocks in place.
 
                 Args:
                     stage (nn.Module): Model layers to be shifted.
+                    children (list[tuple[str, nn.Module]]): Named children
+                        of ``stage``.
                     num_segments (int): Number of frame segments.
-
-                Returns:
-                    nn.Module: The shifted blocks.
                 """
-                blocks = list(stage.children())
-                for i, b in enumerate(blocks):
+                for i, (_, b) in enumerate(children):
                     if i % n_round == 0:
-                        blocks[i].dwconv = TemporalShift(
+                        b.dwconv = TemporalShiftDWConv(
                             b.dwconv,
                             num_segments=num_segments,
                             shift_div=self.shift_div)
-                return nn.Sequential(*blocks)
-
-            self.stages[0] = make_block_temporal(self.stages[0], num_segment_list[0])
-            self.stages[1] = make_block_temporal(self.stages[1], num_segment_list[1])
-            self.stages[2] = make_block_temporal(self.stages[2], num_segment_list[2])
-            self.stages[3] = make_block_temporal(self.stages[3], num_segment_list[3])
 
         else:
             raise NotImplementedError
 
+        for stage, children, num_segments in zip(self.stages, stage_children,
+                                                 num_segment_list):
+            make_block_temporal(stage, children, num_segments)
+
+    def compile_temporal_shift(self):
+        """Compile the forward of all temporal shift modules with
+        ``torch.compile``."""
+        if not hasattr(torch, 'compile'):
+            warnings.warn('compile_shift requires PyTorch >= 2.0, the '
+                          'temporal shift modules are left uncompiled')
+            return
+        for m in self.modules():
+            if isinstance(m, TemporalShift):
+                m.forward = torch.compile(
+                    m.forward, dynamic=False, mode='reduce-overhead')
+
     def make_temporal_pool(self):
-        """Make temporal pooling between layer1 and layer2, using a 3D max
-        pooling layer."""
+        """Make temporal pooling between stage 0 and stage 1, using a max
+        pooling over time."""
 
         class TemporalPool(nn.Module):
             """Temporal pool module.
 
-            Wrap layer2 in ResNet50 with a 3D max pooling layer.
+            Wrap the downsampling layer in front of stage 1 of ConvNeXt with
+            a temporal max pooling (kernel 3, stride 2, padding 1), matching
+            ``nn.MaxPool3d((3, 1, 1), (2, 1, 1), (1, 0, 0))``.
 
             Args:
                 net (nn.Module): Module to make temporal pool.
@@ -211,22 +827,30 @@ class ConvNeXtTSM(ConvNeXt):
                 super().__init__()
                 self.net = net
                 self.num_segments = num_segments
-                self.max_pool3d = nn.MaxPool3d(
-                    kernel_size=(3, 1, 1), stride=(2, 1, 1), padding=(1, 0, 0))
 
             def forward(self, x):
-                # [N, C, H, W]
-                n, c, h, w = x.size()
-                # [N // num_segments, C, num_segments, H, W]
-                x = x.view(n // self.num_segments, self.num_segments, c, h,
-                           w).transpose(1, 2)
-                # [N // num_segmnets, C, num_segments // 2, H, W]
-                x = self.max_pool3d(x)
+                if x.size(0) % self.num_segments != 0:
+                    raise ValueError(
+                        f'batch size {x.size(0)} is not divisible by '
+                        f'num_segments {self.num_segments}')
+                # [N // num_segments, num_segments, C, H, W], or
+                # [N // num_segments, num_segments, H, W, C] for channels_last
+                x, dim = _time_view(x, self.num_segments)
+                # pad one frame on each side of time, -inf like max pooling
+                x = F.pad(x, (0, 0, 0, 0, 0, 0, 1, 1), value=float('-inf'))
+                # pool over the time windows without a transpose round-trip
+                x = x.unfold(1, 3, 2).amax(-1)
                 # [N // 2, C, H, W]
-                x = x.transpose(1, 2).contiguous().view(n // 2, c, h, w)
+                x = _time_unview(x, dim)
                 return self.net(x)
 
-        self.layer2 = TemporalPool(self.layer2, self.num_segments)
+        # stages 1-3 run on num_segments // 2 frames, see make_temporal_shift,
+        # an odd count would pool to ceil(num_segments / 2) frames instead
+        if self.num_segments % 2 != 0:
+            raise ValueError('num_segments must be even for temporal_pool, '
+                             f'got {self.num_segments}')
+        self.downsample_layers[1] = TemporalPool(self.downsample_layers[1],
+                                                 self.num_segments)
 
 
     def init_weights(self):
@@ -235,5 +859,7 @@ class ConvNeXtTSM(ConvNeXt):
         super().init_weights()
         if self.is_shift:
             self.make_temporal_shift()
+            if self.compile_shift:
+                self.compile_temporal_shift()
         if self.temporal_pool:
             self.make_temporal_pool()
@@ -0,0 +1,90 @@
+import pytest
+import torch
+import torch.nn as nn
+from torch.testing import assert_close
+
+from mmaction.models.backbones.convnext_tsm import (TemporalShift,
+                                                    TemporalShiftDWConv,
+                                                    _load_tsm_cuda_ext,
+                                                    _shift_copy)
+
+pytestmark = pytest.mark.skipif(
+    not torch.cuda.is_available(), reason='requires CUDA')
+
+# (num_segments, shift_div) for 32 channels, shift_div=64 gives fold=0
+_SHIFTS = [(4, 8), (1, 8), (4, 64)]
+# (atol, rtol), bf16 results are compared with the fp32 reference
+_TOLS = {torch.float32: (1e-4, 1e-4), torch.bfloat16: (1e-1, 2e-2)}
+
+
+@pytest.fixture(autouse=True)
+def _cuda_ext():
+    if _load_tsm_cuda_ext() is None:
+        pytest.skip('the fused temporal shift kernel can not be built')
+    # keep the reference convs out of TF32
+    allow_tf32 = torch.backends.cudnn.allow_tf32
+    torch.backends.cudnn.allow_tf32 = False
+    yield
+    torch.backends.cudnn.allow_tf32 = allow_tf32
+
+
+def _input(num_segments, dtype, channels_last):
+    x = torch.randn(2 * num_segments, 32, 9, 9, device='cuda')
+    if channels_last:
+        x = x.contiguous(memory_format=torch.channels_last)
+    return x.to(dtype)
+
+
+@pytest.mark.parametrize('dtype', [torch.float32, torch.bfloat16])
+@pytest.mark.parametrize('channels_last', [False, True])
+@pytest.mark.parametrize('num_segments,shift_div', _SHIFTS)
+def test_fused_temporal_shift(num_segments, shift_div, dtype, channels_last):
+    x = _input(num_segments, dtype, channels_last).requires_grad_()
+    fold = x.size(1) // shift_div
+
+    out = TemporalShift.shift(x, num_segments, shift_div)
+    grad_out = torch.randn_like(out)
+    grad_x, = torch.autograd.grad(out, x, grad_out)
+
+    # a shift only moves values, the result is exact in any dtype
+    x_ref = x.detach().requires_grad_()
+    out_ref = _shift_copy(x_ref, num_segments, fold)
+    grad_x_ref, = torch.autograd.grad(out_ref, x_ref, grad_out)
+
+    assert torch.equal(out, out_ref)
+    assert torch.equal(grad_x, grad_x_ref)
+
+
+@pytest.mark.parametrize('dtype', [torch.float32, torch.bfloat16])
+@pytest.mark.parametrize('channels_last', [False, True])
+@pytest.mark.parametrize('num_segments,shift_div', _SHIFTS)
+def test_fused_shift_dwconv(num_segments, shift_div, dtype, channels_last):
+    net = nn.Conv2d(32, 32, kernel_size=7, padding=3, groups=32).cuda()
+    module = TemporalShiftDWConv(
+        net, num_segments=num_segments, shift_div=shift_div).to(dtype)
+    assert module.fusable
+
+    x = _input(num_segments, dtype, channels_last).requires_grad_()
+    fold = x.size(1) // shift_div
+
+    out = module(x)
+    grad_out = torch.randn_like(out)
+    grad_x, grad_w, grad_b = torch.autograd.grad(
+        out, (x, net.weight, net.bias), grad_out)
+
+    # the unfused reference, in fp32 from the same inputs
+    net_ref = nn.Conv2d(32, 32, kernel_size=7, padding=3, groups=32).cuda()
+    net_ref.load_state_dict(
+        {k: v.float()
+         for k, v in net.state_dict().items()})
+    x_ref = x.detach().float().requires_grad_()
+    out_ref = net_ref(_shift_copy(x_ref, num_segments, fold))
+    grad_x_ref, grad_w_ref, grad_b_ref = torch.autograd.grad(
+        out_ref, (x_ref, net_ref.weight, net_ref.bias), grad_out.float())
+
+    atol, rtol = _TOLS[dtype]
+    assert out.dtype == dtype
+    assert_close(out.float(), out_ref, atol=atol, rtol=rtol)
+    assert_close(grad_x.float(), grad_x_ref, atol=atol, rtol=rtol)
+    assert_close(grad_w.float(), grad_w_ref, atol=atol, rtol=rtol)
+    assert_close(grad_b.float(), grad_b_ref, atol=atol, rtol=rtol)
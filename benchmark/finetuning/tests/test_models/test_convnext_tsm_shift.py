@@ -0,0 +1,32 @@
+import pytest
+import torch
+
+from mmaction.models.backbones import convnext_tsm
+from mmaction.models.backbones.convnext_tsm import TemporalShift
+
+
+@pytest.mark.parametrize('channels_last', [False, True])
+@pytest.mark.parametrize('num_segments', [1, 4])
+@pytest.mark.parametrize('name',
+                         ['_scripted_shift_copy', '_shift_roll', '_shift_pad'])
+def test_shift_bf16_matches_fp32(name, num_segments, channels_last,
+                                 monkeypatch):
+    # force the CPU candidate instead of the benchmarked one
+    shift = getattr(convnext_tsm, name)
+    monkeypatch.setattr(convnext_tsm, '_cpu_shift', {})
+    monkeypatch.setattr(convnext_tsm, '_select_cpu_shift',
+                        lambda x, num_segments, fold, key: shift)
+
+    # round to bf16 first, so both runs shift the same values
+    x = torch.randn(2 * num_segments, 16, 5, 7).to(torch.bfloat16)
+    if channels_last:
+        x = x.contiguous(memory_format=torch.channels_last)
+
+    out = TemporalShift.shift(x, num_segments, shift_div=4)
+    out_fp32 = TemporalShift.shift(x.float(), num_segments, shift_div=4)
+
+    assert out.dtype == torch.bfloat16
+    assert out.is_contiguous(
+        memory_format=torch.channels_last) == channels_last
+    # a shift only moves values, so it is exact in bf16
+    assert torch.equal(out.float(), out_fp32)